@@ -27,16 +27,18 @@ Supports VGM format 1.50:
  - https://www.smspower.org/uploads/Music/vgmspec150.txt
  - There are newer VGM formats, but supporting the one used in Deflemask.
 
-**Software and Dependencies:**
+**Hardware:**
 
-* micropython-74hc595: https://github.com/mcauser/micropython-74hc595
+* RP2040: the SN74HC595 is driven through the SPI0 and SIO registers directly.
 
 """
 
-import struct
+import gc
 import time
 
-from sr_74hc595_spi import SR #K: adafruit_74hc595 Library Replacement
+import micropython
+from micropython import const
+
 import machine #K: same or similar as board module
 from machine import SPI #K: Serial protocols library, same as busio.SPI class
 from machine import Pin #K: Digital input/output library, same as digitalio
@@ -56,6 +58,76 @@ from machine import Pin #K: Digital input/output library, same as digitalio
 
 __docformat__ = "restructuredtext"
 
+# VGM commands
+_CMD_PSG = const(0x50)  # 0x50 dd: PSG (SN76489/SN76496) write value dd
+_CMD_WAIT = const(0x61)  # 0x61 nn nn: wait n samples
+_CMD_WAIT_60 = const(0x62)  # 0x62: wait 735 samples (60th of a second)
+_CMD_END = const(0x66)  # 0x66: end of sound data
+
+# SN76489 input clock, in Hz
+_CLOCK = const(3579545)
+
+# RP2040 registers, as ptr32 bases and word indexes
+_SPI0_BASE = const(0x4003C000)
+_SSPDR = const(2)  # +0x08: data
+_SSPSR = const(3)  # +0x0c: status
+_SSPSR_RNE = const(0x04)  # RX FIFO not empty
+_SSPSR_BSY = const(0x10)  # busy
+_SIO_BASE = const(0xD0000000)
+_GPIO_OUT_SET = const(5)  # +0x14
+_GPIO_OUT_CLR = const(6)  # +0x18
+
+# Event wait meaning "no wait": go on with the next event in the same tick
+_NO_WAIT = const(0xFF)
+
+# Waits longer than this (in 1/60s ticks) leave time for a garbage collection
+_GC_IDLE_TICKS = const(30)
+
+# SN76489 write timing. The chip needs about 32 clock cycles to load a byte
+# (8.9 us at 3.579545 MHz) while WE is low and the data is held; READY is not
+# wired, so WE is simply held low for longer than that. The 74HC595 outputs
+# keep the byte until the next latch, which only comes after WE is high again.
+_WE_LOW_US = const(10)
+# 74HC595 rclk pulse width: tw(min) is 80 ns at 2 V, 1 us is plenty
+_LATCH_HIGH_US = const(1)
+
+# 74HC595 rclk (latch) and SN76489 WE pins
+_LATCH_PIN = const(8)
+_WE_PIN = const(9)
+_LATCH_MASK = const(1 << _LATCH_PIN)
+_WE_MASK = const(1 << _WE_PIN)
+
+
+def _u32(buf, offset: int) -> int:
+    # unpack little endian unsigned int
+    return (
+        buf[offset]
+        | (buf[offset + 1] << 8)
+        | (buf[offset + 2] << 16)
+        | (buf[offset + 3] << 24)
+    )
+
+
+def _note_regs() -> bytes:
+    # Tone register (lsb, msb) pairs for every note from C0 to B#9 (C10), so
+    # playing a note needs no floating point math.
+    # Initial note C0:
+    # https://pages.mtu.edu/~suits/notefreqs.html
+    note_c0 = 16.35
+    regs = bytearray((10 * 12 + 1) * 2)
+    for distance in range(10 * 12 + 1):
+        freq = note_c0 * (2 ** (distance / 12))
+        reg = int(_CLOCK // (freq * 2 * 16))
+        # 1022 and 1023 are reserved for samples
+        if reg > 1021:
+            reg = 1021
+        regs[distance * 2] = reg & 15
+        regs[distance * 2 + 1] = reg >> 4
+    return bytes(regs)
+
+
+_NOTE_REGS = _note_regs()
+
 
 class Music76489:
     """
@@ -64,22 +136,30 @@ class Music76489:
     For detailed information about the internals of the SN76489 chip, read:
     https://www.smspower.org/Development/SN76489
     """
+    # Semitone offset from C of the natural notes, indexed by ord(note) - ord("A")
+    _CHROMATIC = b"\x09\x0b\x00\x02\x04\x05\x07"
+
+    # Volume off (latch + volume 0xf) for channels 0-3
+    _RESET_SEQ = b"\x9f\xbf\xdf\xff"
+
+    # Note durations
+    _DURATIONS = {
+        "W": 64,  # Whole
+        "H": 32,  # Half
+        "Q": 16,  # Quarter
+        "I": 8,  # Eighth
+        "S": 4,  # Sixteenth
+    }
+
     def __init__(self):
-        self._offset = 0
-        self._data = bytearray()
-        self._should_loop = False
-        self._loop_offset = 0
-        self._prev_time = time.ticks_ms()/1000 #K: same behavior as time.monotonic()
         self._ticks_to_wait = 0
         self._end_of_song = False
+        self._clear_song()
 
-        self._spi = SPI(0, sck=Pin(6), mosi=Pin(7)) #K: SPI protocol pin assignment, same as busio.SPI(Clock, MOSI/TX(Optional)=board.pin, MISO/RX(Optional)=board.pin)
-        self._latch_pin = Pin(8) #K: Pin A3 digital assignment, same as digitalio.DigitalInOut(board.pin) (rclk)
-        self._sr = SR(self._spi, self._latch_pin) #K: adafruit_74hc595 ShiftRegister74HC595 class __init__ Replacement
-        self._sn76489_we = Pin(9) #K: Pin A4 digital assignment, same as digitalio.DigitalInOut(board.pin)
-        self._sn76489_we = Pin(9, Pin.OUT) #K: Pin A4 digital OUTPUT assignment, same as .direction = digitalio.Direction.OUTPUT
-
-        self._sn76489_we.value(True) #K: same as '.value = True'
+        # 1 MHz, 8-bit, mode 0, MSB first frames: _write_port_data pushes bytes straight into SPI0's FIFO
+        self._spi = SPI(0, baudrate=1_000_000, bits=8, polarity=0, phase=0, firstbit=SPI.MSB, sck=Pin(6), mosi=Pin(7)) #K: SPI protocol pin assignment, same as busio.SPI(Clock, MOSI/TX(Optional)=board.pin, MISO/RX(Optional)=board.pin)
+        self._latch_pin = Pin(_LATCH_PIN, Pin.OUT) #K: Pin A3 digital OUTPUT assignment, same as digitalio.DigitalInOut(board.pin) (rclk)
+        self._sn76489_we = Pin(_WE_PIN, Pin.OUT, value=1) #K: Pin A4 digital OUTPUT assignment, initially high, same as .direction = digitalio.Direction.OUTPUT and '.value = True'
 
         self.reset()
 
@@ -95,17 +175,17 @@ class Music76489:
         self.reset()
         with open(filename, "rb") as file:
             # Assuming VGM version is 1.50 (64 bytes of header)
-            header = bytearray(file.read(0x40))
+            header = file.read(0x40)
 
             # 0x00: "Vgm " (0x56 0x67 0x6d 0x20) file identification (32 bits)
-            if header[:4].decode("utf-8") != "Vgm ":
+            if header[:4] != b"Vgm ":
                 raise Exception("Invalid header")
 
             # 0x08: Version number (32 bits)
             #  Version 1.50 is stored as 0x00000150 (0x50 0x01 0x00 0x00).
             #  This is used for backwards compatibility in players, and defines which
             #  header values are valid.
-            vgm_version = struct.unpack_from("<I", header, 8)[0]
+            vgm_version = _u32(header, 8)
             if vgm_version != 0x150:
                 raise Exception(
                     f"Invalid VGM version format; got {vgm_version:x}, want 0x150"
@@ -114,8 +194,8 @@ class Music76489:
             # 0x0c: SN76489 clock (32 bits)
             #  Input clock rate in Hz for the SN76489 PSG chip. A typical value is
             #  3579545. It should be 0 if there is no PSG chip used.
-            sn76489_clock = struct.unpack_from("<I", header, 12)[0]
-            if sn76489_clock != 3579545:
+            sn76489_clock = _u32(header, 12)
+            if sn76489_clock != _CLOCK:
                 raise Exception(
                     f"Invalid VGM clock freq; got {sn76489_clock}, want 3579545"
                 )
@@ -124,18 +204,182 @@ class Music76489:
             #  Relative offset to end of file (i.e. file length - 4).
             #  This is mainly used to find the next track when concatanating
             #  player stubs and multiple files.
-            file_len = struct.unpack_from("<I", header, 4)[0]
-            self._data = bytearray(file.read(file_len + 4 - 0x40))
+            end = _u32(header, 4) + 4
 
             # 0x1c: Loop offset (32 bits)
             #  Relative offset to loop point, or 0 if no loop.
             #  For example, if the data for the one-off intro to a song was in bytes
             #  0x0040-0x3fff of the file, but the main looping section started at
             #  0x4000, this would contain the value 0x4000-0x1c = 0x00003fe4.
-            loop = struct.unpack_from("<I", header, 0x1C)[0]
-            self._should_loop = bool(loop != 0)
-            self._loop_offset = loop + 0x1C - 0x40
+            loop = _u32(header, 0x1C)
+            loop_offset = loop + 0x1C if loop != 0 else -1
+
+            self._preparse(file, end, loop_offset)
+        self._ticks_to_wait = 0
+        self._end_of_song = False
+
+    def _preparse(self, file, end: int, loop_offset: int) -> None:
+        # Decode the VGM commands once, so that tick() only has to replay them.
+        #
+        # The song is split in events: the PSG writes found between two waits,
+        # followed by the wait itself (in 1/60s ticks). Event k writes the next
+        # counts[k] bytes of writes and then waits waits[k] ticks, or goes on
+        # with event k + 1 in the same tick if waits[k] is _NO_WAIT.
+        # The last event holds the writes before "end of sound data" and has no
+        # wait: playback either loops or stops there.
+        #
+        # A first pass only counts writes and events, so that a second one can
+        # fill arrays of the exact size instead of growing them.
+        buf = bytearray(512)
+        n_writes, n_events, _, _ = self._decode(file, end, loop_offset, buf, None)
+        writes = bytearray(n_writes)
+        counts = bytearray(n_events)
+        waits = bytearray(n_events)
+        file.seek(0x40)
+        _, _, loop_event, loop_write = self._decode(
+            file, end, loop_offset, buf, (writes, counts, waits)
+        )
+
+        self._writes = writes
+        self._counts = counts
+        self._waits = waits
+        self._last_event = n_events - 1
+        self._loop_event = loop_event
+        self._loop_write = loop_write
+
+    def _decode(self, file, end: int, loop_offset: int, data, song):
+        # Walk the VGM commands of file, streamed through the data buffer so
+        # that the raw song never has to fit in RAM. Fill song, a
+        # (writes, counts, waits) tuple, unless it is None.
+        # Return the number of writes and events, and where the loop starts.
+        #
+        # Valid commands
+        #  0x4f dd    : Game Gear PSG stereo, write dd to port 0x06
+        #  0x50 dd    : PSG (SN76489/SN76496) write value dd
+        #  0x51 aa dd : YM2413, write value dd to register aa
+        #  0x52 aa dd : YM2612 port 0, write value dd to register aa
+        #  0x53 aa dd : YM2612 port 1, write value dd to register aa
+        #  0x54 aa dd : YM2151, write value dd to register aa
+        #  0x61 nn nn : Wait n samples, n can range from 0 to 65535 (approx 1.49
+        #               seconds). Longer pauses than this are represented by multiple
+        #               wait commands.
+        #  0x62       : wait 735 samples (60th of a second), a shortcut for
+        #               0x61 0xdf 0x02
+        #  0x63       : wait 882 samples (50th of a second), a shortcut for
+        #               0x61 0x72 0x03
+        #  0x66       : end of sound data
+        #  0x67 ...   : data block: see below
+        #  0x7n       : wait n+1 samples, n can range from 0 to 15.
+        #  0x8n       : YM2612 port 0 address 2A write from the data bank, then wait
+        #               n samples; n can range from 0 to 15. Note that the wait is n,
+        #               NOT n+1.
+        #  0xe0 dddddddd : seek to offset dddddddd (Intel byte order) in PCM data bank
+        if song is not None:
+            writes, counts, waits = song
+        n_writes = 0
+        n_events = 0
+        count = 0  # writes in the current event
+        loop_event = -1
+        loop_write = 0
+
+        mv = memoryview(data)
+        left = end - 0x40  # bytes of the file not read yet
+        fill = 0  # valid bytes in data
+        p = 0  # position in data of the command at file offset i
+        i = 0x40
+        while True:
+            if i == loop_offset:
+                # Start an event at the loop point, so that looping replays it
+                # from its first write
+                if count:
+                    if song is not None:
+                        counts[n_events] = count
+                        waits[n_events] = _NO_WAIT
+                    n_events += 1
+                    count = 0
+                loop_event = n_events
+                loop_write = n_writes
+
+            # Commands are at most 3 bytes long. Refill before one of them can
+            # straddle the end of the buffer, carrying over its first bytes.
+            if fill - p < 3 and left > 0:
+                rem = fill - p
+                for q in range(rem):
+                    data[q] = data[p + q]
+                got = file.readinto(mv[rem : rem + min(len(data) - rem, left)])
+                # Nothing read: the file is shorter than its header says
+                got = got or 0
+                left = left - got if got else 0
+                fill = rem + got
+                p = 0
+
+            if p >= fill:
+                raise Exception("unexpected offset: %d >= %d" % (i, end))
+
+            # print(f'data: 0x{data[p]:02x}')
+
+            wait = -1
+
+            #  0x50 dd    : PSG (SN76489/SN76496) write value dd
+            if data[p] == _CMD_PSG:
+                if song is not None:
+                    writes[n_writes] = data[p + 1]
+                n_writes += 1
+                count += 1
+                if count == 255:
+                    # counts are bytes: go on in a new event
+                    wait = _NO_WAIT
+                p = p + 2
+                i = i + 2
+
+            #  0x61 nn nn : Wait n samples, n can range from 0 to 65535 (approx 1.49
+            #               seconds). Longer pauses than this are represented by multiple
+            #               wait commands.
+            elif data[p] == _CMD_WAIT:
+                # little endian unsigned short, 735 samples == 1/60s
+                # (at most 89 ticks, so it fits in a byte)
+                wait = (data[p + 1] | (data[p + 2] << 8)) // 735
+                p = p + 3
+                i = i + 3
+
+            #  0x62       : wait 735 samples (60th of a second), a shortcut for
+            #               0x61 0xdf 0x02
+            elif data[p] == _CMD_WAIT_60:
+                wait = 1
+                p = p + 1
+                i = i + 1
+
+            #  0x66       : end of sound data
+            elif data[p] == _CMD_END:
+                if song is not None:
+                    counts[n_events] = count
+                n_events += 1
+                break
 
+            else:
+                raise Exception("Unknown value: data[0x%x] = 0x%x" % (i, data[p]))
+
+            if wait >= 0:
+                if song is not None:
+                    counts[n_events] = count
+                    waits[n_events] = wait
+                n_events += 1
+                count = 0
+
+        return n_writes, n_events, loop_event, loop_write
+
+    def _clear_song(self) -> None:
+        # An empty song: a single event with no writes and no loop
+        self._writes = bytearray()
+        self._counts = bytearray(1)
+        self._waits = bytearray(1)
+        self._last_event = 0
+        self._loop_event = -1
+        self._loop_write = 0
+        self._event = 0
+        self._write = 0
+
+    @micropython.native
     def tick(self) -> None:
         """
         Play the loaded VGM song.
@@ -157,77 +401,39 @@ class Music76489:
             return
 
         # Convert to local variables (easier to ready... and tiny bit faster?)
-        data = self._data
-        i = self._offset
+        writes = self._writes
+        counts = self._counts
+        waits = self._waits
+        last_event = self._last_event
+        loop_event = self._loop_event
+        k = self._event
+        j = self._write
         while True:
-            if i >= len(data):
-                raise Exception(f"unexpected offset: {i} >= {len(data)}")
-
-            # Valid commands
-            #  0x4f dd    : Game Gear PSG stereo, write dd to port 0x06
-            #  0x50 dd    : PSG (SN76489/SN76496) write value dd
-            #  0x51 aa dd : YM2413, write value dd to register aa
-            #  0x52 aa dd : YM2612 port 0, write value dd to register aa
-            #  0x53 aa dd : YM2612 port 1, write value dd to register aa
-            #  0x54 aa dd : YM2151, write value dd to register aa
-            #  0x61 nn nn : Wait n samples, n can range from 0 to 65535 (approx 1.49
-            #               seconds). Longer pauses than this are represented by multiple
-            #               wait commands.
-            #  0x62       : wait 735 samples (60th of a second), a shortcut for
-            #               0x61 0xdf 0x02
-            #  0x63       : wait 882 samples (50th of a second), a shortcut for
-            #               0x61 0x72 0x03
-            #  0x66       : end of sound data
-            #  0x67 ...   : data block: see below
-            #  0x7n       : wait n+1 samples, n can range from 0 to 15.
-            #  0x8n       : YM2612 port 0 address 2A write from the data bank, then wait
-            #               n samples; n can range from 0 to 15. Note that the wait is n,
-            #               NOT n+1.
-            #  0xe0 dddddddd : seek to offset dddddddd (Intel byte order) in PCM data bank
-
-            # print(f'data: 0x{data[i]:02x}')
-
-            #  0x50 dd    : PSG (SN76489/SN76496) write value dd
-            if data[i] == 0x50:
-                self._write_port_data(data[i + 1])
-                i = i + 2
+            end = j + counts[k]
+            if j < end:
+                self._write_port_burst(writes, j, end)
+                j = end
 
-            #  0x61 nn nn : Wait n samples, n can range from 0 to 65535 (approx 1.49
-            #               seconds). Longer pauses than this are represented by multiple
-            #               wait commands.
-            elif data[i] == 0x61:
-                # unpack little endian unsigned short
-                delay = struct.unpack_from("<H", data, i + 1)[0]
-                self._delay_n(delay)
-                i = i + 3
-                break
-
-            #  0x62       : wait 735 samples (60th of a second), a shortcut for
-            #               0x61 0xdf 0x02
-            elif data[i] == 0x62:
-                self._delay_one()
-                i = i + 1
-                break
-
-            #  0x66       : end of sound data
-            elif data[i] == 0x66:
-                if self._should_loop:
-                    i = self._loop_offset
-                else:
+            if k == last_event:
+                if loop_event < 0:
                     self._end_of_song = True
                     break
-
+                k = loop_event
+                j = self._loop_write
             else:
-                raise Exception("Unknown value: data[0x%x] = 0x%x" % (i, data[i]))
-        # update offset
-        self._offset = i
-
-    def _delay_one(self) -> None:
-        self._ticks_to_wait += 1
+                wait = waits[k]
+                k += 1
+                if wait != _NO_WAIT:
+                    self._ticks_to_wait += wait
+                    break
+        # update position
+        self._event = k
+        self._write = j
 
-    def _delay_n(self, samples: int) -> None:
-        # 735 samples == 1/60s
-        self._ticks_to_wait += samples // 735
+        # Collect now, while the song is idle, rather than letting an automatic
+        # collection stall a later tick
+        if self._ticks_to_wait > _GC_IDLE_TICKS:
+            gc.collect()
 
     def play_vgm(self, filename: str) -> None:
         """
@@ -239,10 +445,25 @@ class Music76489:
         :param str filename: The VGM file to play.
         """
         self.load_vgm(filename)
-        while not self._end_of_song:
-            self.tick()
-            # One tick == 1/60 of a second
-            time.sleep(1 / 60)
+        # Playback allocates nothing: collect once up front and keep automatic
+        # collections from pausing a tick. tick() collects during long waits.
+        gc.collect()
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # One tick == 1/60 of a second. Sleep until an absolute deadline so
+            # that the time spent in tick() does not make the song drift.
+            period_us = 16667
+            deadline = time.ticks_add(time.ticks_us(), period_us)
+            while not self._end_of_song:
+                self.tick()
+                sleep_us = time.ticks_diff(deadline, time.ticks_us())
+                if sleep_us > 0:
+                    time.sleep_us(sleep_us)
+                deadline = time.ticks_add(deadline, period_us)
+        finally:
+            if gc_enabled:
+                gc.enable()
 
     def play_freq(self, channel: int, freq: float) -> None:
         """
@@ -255,16 +476,15 @@ class Music76489:
         # Although freqs > 7902.13 shouldn't be used
         # In terms of musical notes the range is: [A2 - B8+]
         # Formula taken from here: https://www.smspower.org/Development/SN76489
-        clock = 3579545  # Hz
-        reg = int(clock // (freq * 2 * 16))
+        reg = int(_CLOCK // (freq * 2 * 16))
 
         # 1022 and 1023 are reserved for samples
         if reg > 1021:
             reg = 1021
 
-        lsb = reg & 15
-        msb = reg >> 4
+        self._write_tone(channel, reg & 15, reg >> 4)
 
+    def _write_tone(self, channel: int, lsb: int, msb: int) -> None:
         # Latch + tone
         # bit7: 1=Latch
         # bit4: 0=Tone
@@ -283,12 +503,9 @@ class Music76489:
         self._write_port_data(data)
 
     def _play_note(self, voice: int, note: int, octave: int) -> None:
-        # Initial note C0:
-        # https://pages.mtu.edu/~suits/notefreqs.html
-        note_c0 = 16.35
-        distance = octave * 12 + note
-        freq = note_c0 * (2 ** (distance / 12))
-        self.play_freq(voice, freq)
+        # Tone register for C0-B#9, see _note_regs()
+        k = (octave * 12 + note) * 2
+        self._write_tone(voice, _NOTE_REGS[k], _NOTE_REGS[k + 1])
 
     def play_notes(self, notes: str) -> None:
         """
@@ -319,15 +536,15 @@ class Music76489:
         octave = 4
         duration = 16
 
-        # Hack
-        notes = notes + " "
-
+        count = len(notes)
         i = 0
-        while i < len(notes):
+        while i < count:
             n = notes[i]
             if n == "V":
-                # Voice: voices go from 0-2
+                # Voice: voices go from 0-2 (channel 3 is noise, see play_noise())
                 voice = int(notes[i + 1])
+                if voice > 2:
+                    raise Exception("Invalid voice: %d" % voice)
                 i += 2
             elif n == "O":
                 octave = int(notes[i + 1])
@@ -335,24 +552,10 @@ class Music76489:
             elif n in "CDEFGAB":
                 # Notes that belong to the chromatic scale:
                 # C, C#, D, D#, E, F, F#, G, G#, A, A#, B
-                chromatic = {
-                    "C": 0,
-                    "C#": 1,
-                    "D": 2,
-                    "D#": 3,
-                    "E": 4,
-                    "F": 5,
-                    "F#": 6,
-                    "G": 7,
-                    "G#": 8,
-                    "A": 9,
-                    "A#": 10,
-                    "B": 11,
-                }
-                if notes[i + 1] == "#":
-                    n = n + "#"
+                note = Music76489._CHROMATIC[ord(n) - ord("A")]
+                if i + 1 < count and notes[i + 1] == "#":
+                    note += 1
                     i += 1
-                note = chromatic[n]
                 self.set_vol(voice, 9)
                 self._play_note(voice, note, octave)
                 i += 1
@@ -368,14 +571,7 @@ class Music76489:
                 self.set_vol(voice, vol)
                 i += 2
             elif n in "WHQIS":
-                dur_dict = {
-                    "W": 64,  # Whole
-                    "H": 32,  # Half
-                    "Q": 16,  # Quarter
-                    "I": 8,  # Eighth
-                    "S": 4,  # Sixteenth
-                }
-                duration = dur_dict[n]
+                duration = Music76489._DURATIONS[n]
                 i += 1
             elif n in " ,":
                 i += 1
@@ -421,16 +617,52 @@ class Music76489:
         data |= 15 - vol
         self._write_port_data(data)
 
-    def _write_port_data(self, byte_data) -> None:
-        # Send data
-        self._sr[0] = byte_data #K: sr.gpio replacement
-
-        # Enable SN76489
-        self._sn76489_we.value(False) #K: same as '.value = False'
-        # Allow it to read, and wait a very small time
-        time.sleep_us(1)
-        # Disable SN76489
-        self._sn76489_we.value(True) #K: same as '.value = True'
+    @micropython.viper
+    def _write_port_data(self, byte_data: int):
+        spi0 = ptr32(_SPI0_BASE)
+        sio = ptr32(_SIO_BASE)
+
+        # Send data, then wait for the transfer to end
+        spi0[_SSPDR] = byte_data
+        while spi0[_SSPSR] & _SSPSR_BSY:
+            pass
+        # Drain the RX FIFO so it never overruns
+        while spi0[_SSPSR] & _SSPSR_RNE:
+            spi0[_SSPDR]
+
+        # Latch the shift register: rclk rising edge
+        sio[_GPIO_OUT_SET] = _LATCH_MASK
+        time.sleep_us(_LATCH_HIGH_US)
+        sio[_GPIO_OUT_CLR] = _LATCH_MASK
+
+        # Enable SN76489: WE low
+        sio[_GPIO_OUT_CLR] = _WE_MASK
+        # Allow it to read the byte
+        time.sleep_us(_WE_LOW_US)
+        # Disable SN76489: WE high
+        sio[_GPIO_OUT_SET] = _WE_MASK
+
+    @micropython.viper
+    def _write_port_burst(self, buf: ptr8, start: int, end: int):
+        # Same as _write_port_data() for buf[start:end], in a single call
+        spi0 = ptr32(_SPI0_BASE)
+        sio = ptr32(_SIO_BASE)
+        k = start
+        while k < end:
+            spi0[_SSPDR] = buf[k]
+            while spi0[_SSPSR] & _SSPSR_BSY:
+                pass
+            while spi0[_SSPSR] & _SSPSR_RNE:
+                spi0[_SSPDR]
+
+            sio[_GPIO_OUT_SET] = _LATCH_MASK
+            time.sleep_us(_LATCH_HIGH_US)
+            sio[_GPIO_OUT_CLR] = _LATCH_MASK
+
+            sio[_GPIO_OUT_CLR] = _WE_MASK
+            time.sleep_us(_WE_LOW_US)
+            sio[_GPIO_OUT_SET] = _WE_MASK
+            k += 1
 
     def reset(self) -> None:
         """
@@ -438,8 +670,5 @@ class Music76489:
 
         Set volume to 0 in all channels.
         """
-        reset_seq = [0x9F, 0xBF, 0xDF, 0xFF]
-        for b in reset_seq:
-            self._write_port_data(b)
-        self._offset = 0
-        self._data = bytearray()
+        self._write_port_burst(Music76489._RESET_SEQ, 0, len(Music76489._RESET_SEQ))
+        self._clear_song()
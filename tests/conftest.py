@@ -0,0 +1,79 @@
+"""
+Load music76489 under CPython.
+
+The MicroPython-only modules and viper builtins are stubbed with monkeypatch
+for the duration of each test, and the module gets its own fake ``time``, so
+nothing leaks into the rest of the pytest session.
+"""
+
+import builtins
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "music76489.py")
+
+
+class _Pin:
+    OUT = 1
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class _SPI:
+    MSB = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture
+def music76489(monkeypatch):
+    micropython = types.ModuleType("micropython")
+    micropython.native = lambda f: f
+    micropython.viper = lambda f: f
+    micropython.const = lambda x: x
+    machine = types.ModuleType("machine")
+    machine.Pin = _Pin
+    machine.SPI = _SPI
+    monkeypatch.setitem(sys.modules, "micropython", micropython)
+    monkeypatch.setitem(sys.modules, "machine", machine)
+    # Viper annotations are evaluated when the class body runs
+    monkeypatch.setattr(builtins, "ptr8", object, raising=False)
+    monkeypatch.setattr(builtins, "ptr32", object, raising=False)
+
+    # Not registered in sys.modules: every test gets a fresh copy
+    spec = importlib.util.spec_from_file_location("music76489", PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.time = types.SimpleNamespace(
+        ticks_us=lambda: 0,
+        ticks_add=lambda a, b: a + b,
+        ticks_diff=lambda a, b: a - b,
+        sleep=lambda s: None,
+        sleep_us=lambda us: None,
+    )
+    return module
+
+
+@pytest.fixture
+def Music(music76489):
+    class _Music(music76489.Music76489):
+        """Music76489 logging the bytes it would send to the SN76489."""
+
+        def __init__(self):
+            self.log = []
+            super().__init__()
+            self.log.clear()
+
+        def _write_port_data(self, byte_data):
+            self.log.append(byte_data)
+
+        def _write_port_burst(self, buf, start, end):
+            self.log.extend(buf[start:end])
+
+    return _Music
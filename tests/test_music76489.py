@@ -0,0 +1,151 @@
+"""
+CPython tests for the VGM decoding and playback logic of music76489.
+
+See conftest.py for the stubbed MicroPython environment: the viper port
+writers are replaced by a log of the bytes they would send to the SN76489.
+"""
+
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _vgm(commands, loop=None, eof=None):
+    # Build a VGM 1.50 file; loop is an offset into commands
+    header = bytearray(0x40)
+    header[0:4] = b"Vgm "
+    size = 0x40 + len(commands)
+    header[4:8] = (size - 4 if eof is None else eof).to_bytes(4, "little")
+    header[8:12] = (0x150).to_bytes(4, "little")
+    header[12:16] = (3579545).to_bytes(4, "little")
+    if loop is not None:
+        header[0x1C:0x20] = (0x40 + loop - 0x1C).to_bytes(4, "little")
+    return bytes(header) + bytes(commands)
+
+
+def _reference(vgm, ticks):
+    # The byte interpreter tick() used before songs were pre-decoded
+    data = vgm[0x40 : int.from_bytes(vgm[4:8], "little") + 4]
+    loop = int.from_bytes(vgm[0x1C:0x20], "little")
+    out = []
+    i = 0
+    to_wait = 0
+    for _ in range(ticks):
+        written = []
+        to_wait -= 1
+        if to_wait <= 0:
+            while True:
+                if data[i] == 0x50:
+                    written.append(data[i + 1])
+                    i += 2
+                elif data[i] == 0x61:
+                    to_wait += (data[i + 1] | (data[i + 2] << 8)) // 735
+                    i += 3
+                    break
+                elif data[i] == 0x62:
+                    to_wait += 1
+                    i += 1
+                    break
+                elif data[i] == 0x66:
+                    if loop:
+                        i = loop + 0x1C - 0x40
+                    else:
+                        out.append(written)
+                        return out
+        out.append(written)
+    return out
+
+
+def _play(Music, path, ticks):
+    music = Music()
+    music.load_vgm(path)
+    music.log.clear()
+    out = []
+    for _ in range(ticks):
+        music.tick()
+        out.append(list(music.log))
+        music.log.clear()
+        if music._end_of_song:
+            break
+    return music, out
+
+
+@pytest.mark.parametrize("song", ["anime.vgm", "boss_battle.vgm"])
+def test_songs_match_reference(Music, song):
+    path = os.path.join(ROOT, song)
+    with open(path, "rb") as file:
+        vgm = file.read()
+    _, out = _play(Music, path, 20000)
+    assert out == _reference(vgm, 20000)
+
+
+def _check(Music, tmp_path, commands, ticks=200, **kwargs):
+    vgm = _vgm(commands, **kwargs)
+    path = tmp_path / "song.vgm"
+    path.write_bytes(vgm)
+    music, out = _play(Music, str(path), ticks)
+    assert out == _reference(vgm, ticks)
+    return music
+
+
+def test_end_without_loop(Music, tmp_path):
+    music = _check(Music, tmp_path, [0x50, 1, 0x62, 0x50, 2, 0x61, 0xDF, 0x05, 0x50, 3, 0x66])
+    assert music._end_of_song
+    with pytest.raises(Exception, match="End of song reached"):
+        music.tick()
+
+
+def test_loop_point_inside_an_event(Music, tmp_path):
+    # Loop back to the second write of an event
+    music = _check(Music, tmp_path, [0x50, 1, 0x50, 2, 0x50, 3, 0x62, 0x50, 4, 0x66], loop=2)
+    assert music._loop_write == 1
+
+
+def test_loop_point_after_a_wait(Music, tmp_path):
+    _check(Music, tmp_path, [0x50, 1, 0x62, 0x62, 0x50, 2, 0x62, 0x50, 3, 0x66], loop=4)
+
+
+def test_long_write_runs_are_split(Music, tmp_path):
+    run = []
+    for b in range(600):
+        run += [0x50, b & 0xFF]
+    music = _check(Music, tmp_path, run + [0x62, 0x50, 7, 0x66], loop=0)
+    assert max(music._counts) == 255
+
+
+def test_commands_across_buffer_refills(Music, tmp_path):
+    # Waits and writes at every alignment against the 512-byte buffer
+    commands = []
+    for k in range(400):
+        commands += [0x50, k & 0xFF] * (k % 3) + [0x61, k & 0xFF, 0x03] + [0x62] * (k % 2)
+    _check(Music, tmp_path, commands + [0x66], ticks=3000, loop=5)
+
+
+def test_decoded_arrays_are_exact(Music, tmp_path):
+    music = _check(Music, tmp_path, [0x50, 1, 0x50, 2, 0x62, 0x62, 0x50, 3, 0x66])
+    assert bytes(music._writes) == b"\x01\x02\x03"
+    assert bytes(music._counts) == b"\x02\x00\x01"
+    assert len(music._waits) == 3
+
+
+def test_unknown_command(Music, tmp_path):
+    path = tmp_path / "song.vgm"
+    path.write_bytes(_vgm([0x50, 1, 0x4F, 0, 0x66]))
+    with pytest.raises(Exception, match="Unknown value: data\\[0x42\\] = 0x4f"):
+        Music().load_vgm(str(path))
+
+
+def test_truncated_file(Music, tmp_path):
+    path = tmp_path / "song.vgm"
+    path.write_bytes(_vgm([0x50, 1, 0x62], eof=0x100))
+    with pytest.raises(Exception, match="unexpected offset"):
+        Music().load_vgm(str(path))
+
+
+def test_invalid_header(Music, tmp_path):
+    path = tmp_path / "song.vgm"
+    path.write_bytes(b"Xgm " + _vgm([0x66])[4:])
+    with pytest.raises(Exception, match="Invalid header"):
+        Music().load_vgm(str(path))
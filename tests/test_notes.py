@@ -0,0 +1,126 @@
+"""
+CPython tests for the tone and note API of music76489.
+
+The expected bytes come from the floating point formulas and the play_notes
+parser the module used before the note table was precomputed.
+"""
+
+import pytest
+
+_CHROMATIC = {
+    "C": 0,
+    "C#": 1,
+    "D": 2,
+    "D#": 3,
+    "E": 4,
+    "F": 5,
+    "F#": 6,
+    "G": 7,
+    "G#": 8,
+    "A": 9,
+    "A#": 10,
+    "B": 11,
+}
+
+
+def _reference_freq(channel, freq):
+    reg = min(int(3579545 // (freq * 2 * 16)), 1021)
+    return [0x80 | (channel << 5) | (reg & 15), reg >> 4]
+
+
+def _reference_note(voice, note, octave):
+    return _reference_freq(voice, 16.35 * (2 ** ((octave * 12 + note) / 12)))
+
+
+def _reference_vol(channel, vol):
+    return [0x90 | (channel << 5) | (15 - vol)]
+
+
+def _reference_play_notes(notes):
+    out = []
+    voice = 0
+    octave = 4
+    notes = notes + " "
+    i = 0
+    while i < len(notes):
+        n = notes[i]
+        if n == "V":
+            voice = int(notes[i + 1])
+            i += 2
+        elif n == "O":
+            octave = int(notes[i + 1])
+            i += 2
+        elif n in "CDEFGAB":
+            if notes[i + 1] == "#":
+                n = n + "#"
+                i += 1
+            out += _reference_vol(voice, 9)
+            out += _reference_note(voice, _CHROMATIC[n], octave)
+            out += _reference_vol(voice, 0)
+            i += 1
+        elif n == "U":
+            out += _reference_vol(voice, int(notes[i + 1]))
+            i += 2
+        elif n in "WHQIS ,":
+            i += 1
+    return out + _reference_vol(0, 0)
+
+
+@pytest.mark.parametrize("octave", range(10))
+def test_note_table_matches_float_formula(Music, octave):
+    music = Music()
+    for note in range(12):
+        for voice in range(3):
+            music._play_note(voice, note, octave)
+            assert music.log == _reference_note(voice, note, octave)
+            music.log.clear()
+
+
+def test_note_table_covers_b_sharp_9(Music):
+    music = Music()
+    music._play_note(0, 12, 9)
+    assert music.log == _reference_note(0, 12, 9)
+
+
+@pytest.mark.parametrize("freq", [50.0, 110.35, 261.63, 440.0, 7902.13, 55930.4])
+def test_play_freq(Music, freq):
+    music = Music()
+    for channel in range(3):
+        music.play_freq(channel, freq)
+        assert music.log == _reference_freq(channel, freq)
+        music.log.clear()
+
+
+@pytest.mark.parametrize(
+    "notes",
+    [
+        "CDEFGAB",
+        "V1O4CDEF#GA#BQ C U5",
+        "V2O3WCHDQEISF,G A",
+        "O0C O9B",
+        "C#",
+        "D#E",
+    ],
+)
+def test_play_notes(Music, notes):
+    music = Music()
+    music.play_notes(notes)
+    assert music.log == _reference_play_notes(notes)
+
+
+def test_sharp_of_natural_semitones(Music):
+    # E# and B# used to raise KeyError; they are the next semitone
+    for sharp, natural in (("O4E#", "O4F"), ("O4B#", "O5C"), ("V1O2E#B#", "V1O2FO3C")):
+        music = Music()
+        music.play_notes(sharp)
+        sharp_log = list(music.log)
+        music.log.clear()
+        music.play_notes(natural)
+        assert sharp_log == music.log
+
+
+def test_invalid_voice_writes_nothing(Music):
+    music = Music()
+    with pytest.raises(Exception, match="Invalid voice: 3"):
+        music.play_notes("V3C")
+    assert music.log == []